@@ -6,285 +6,740 @@ Scans a React project's components directory and detects violations
 of Atomic Design principles.
 
 Usage:
-    python analyze_structure.py [path_to_src]
+    python analyze_structure.py [path_to_src] [--no-cache] [--jobs N] [--read-ahead N]
     
 Example:
     python analyze_structure.py ./src
     python analyze_structure.py /path/to/project/src
+
+Per-file results are cached in .atomic-analyzer-cache.json next to the
+src directory, so unchanged files are not re-read on the next run.
 """
 
+import argparse
+import hashlib
+import json
 import os
 import re
 import sys
+import tempfile
+import time
+from collections import deque
 from pathlib import Path
 from dataclasses import dataclass, field
-from typing import List, Set
+from enum import IntEnum
+from typing import Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
 
 
-@dataclass
+# Bump whenever a rule, threshold or message changes: cached results are
+# reused as-is, and only the regex patterns and read limit are fingerprinted
+ANALYZER_VERSION = "4"
+CACHE_FILE = '.atomic-analyzer-cache.json'
+# Entries not used for this long are dropped (e.g. from other src dirs)
+CACHE_TTL_SECONDS = 24 * 60 * 60
+
+# Larger files are almost always generated code; only their head is analyzed
+MAX_ANALYZE_BYTES = 256 * 1024
+
+# Below this many files left to analyze after the cache, worker start-up
+# costs more than it saves
+PARALLEL_MIN_FILES = 128
+
+
+class Severity(IntEnum):
+    WARNING = 0
+    ERROR = 1
+
+
+class VType(IntEnum):
+    STRUCTURE = 0
+    BARREL = 1
+    TEST = 2
+    LOGIC = 3
+    DEPENDENCY = 4
+
+
+@dataclass(slots=True)
 class Violation:
-    type: str
+    type: VType
     path: str
+    rel_path: str  # relative to components/, for display
     message: str
-    severity: str = "warning"  # warning | error
+    severity: Severity = Severity.WARNING
 
 
-@dataclass
+@dataclass(slots=True)
 class AnalysisReport:
-    violations: List[Violation] = field(default_factory=list)
+    # Violations are stored column-wise: index i across every column
+    types: List[VType] = field(default_factory=list)
+    paths: List[str] = field(default_factory=list)
+    rel_paths: List[str] = field(default_factory=list)
+    messages: List[str] = field(default_factory=list)
+    severities: bytearray = field(default_factory=bytearray)  # Severity values
+    # Filled by add() so reporting never has to regroup or recount
+    by_type: Dict[VType, List[int]] = field(default_factory=dict)  # indices in insertion order
+    severity_counts: List[int] = field(default_factory=lambda: [0] * len(Severity))
     components_found: int = 0
     components_with_tests: int = 0
     components_with_barrels: int = 0
     
+    def __len__(self) -> int:
+        return len(self.types)
+    
     def add(self, violation: Violation):
-        self.violations.append(violation)
+        self.by_type.setdefault(violation.type, []).append(len(self.types))
+        self.severity_counts[violation.severity] += 1
+        self.types.append(violation.type)
+        self.paths.append(violation.path)
+        self.rel_paths.append(violation.rel_path)
+        self.messages.append(violation.message)
+        self.severities.append(violation.severity)
     
     def has_errors(self) -> bool:
-        return any(v.severity == "error" for v in self.violations)
+        return self.severity_counts[Severity.ERROR] > 0
+
+
+@dataclass
+class _FileCache:
+    """Per-file violations keyed by path, persisted as JSON
+    
+    Each entry records the file's (mtime_ns, size) and content hash: a
+    matching stat reuses the result without opening the file, and a matching
+    hash reuses it after a touch that did not change the content.
+    
+    The cache is sized by the tree itself: on save, entries under this run's
+    prefix that the walk did not visit (deleted or renamed files) are pruned.
+    """
+    path: Path
+    version: str
+    prefix: str = ''
+    # "<src dir name>/<path relative to components/>" ->
+    #     [used_at, mtime_ns, size, digest, [[type, message, severity], ...]]
+    entries: Dict[str, list] = field(default_factory=dict)
+    seen: Set[str] = field(default_factory=set)
+    dirty: bool = False
+    
+    @classmethod
+    def load(cls, path: Path, version: str, prefix: str) -> '_FileCache':
+        cache = cls(path, version, prefix)
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != version:
+                return cache
+            cutoff = time.time() - CACHE_TTL_SECONDS
+            cache.entries = {
+                key: entry for key, entry in data['entries'].items()
+                if entry[0] >= cutoff
+            }
+        except Exception:
+            # Missing, unreadable or malformed cache: start from scratch
+            pass
+        return cache
+    
+    def get(self, key: str) -> Optional[list]:
+        self.seen.add(key)
+        entry = self.entries.get(key)
+        # Refresh used_at only once it is half-way to expiry, so warm runs on
+        # an unchanged tree do not rewrite the cache file every time
+        if entry is not None:
+            now = time.time()
+            if now - entry[0] > CACHE_TTL_SECONDS / 2:
+                entry[0] = now
+                self.dirty = True
+        return entry
+    
+    def put(self, key: str, mtime_ns: int, size: int, digest: str, violations: List[Violation]):
+        self.entries[key] = [
+            time.time(), mtime_ns, size, digest,
+            [[v.type, v.message, v.severity] for v in violations],
+        ]
+        self.dirty = True
+    
+    def touch(self, key: str, mtime_ns: int, size: int) -> list:
+        """Record a new stat for an entry whose content hash still matches"""
+        entry = self.entries[key]
+        entry[1] = mtime_ns
+        entry[2] = size
+        self.dirty = True
+        return entry
+    
+    def save(self):
+        """Write the cache atomically, dropping entries for files no longer in the tree"""
+        stale = [
+            key for key in self.entries
+            if key.startswith(self.prefix) and key not in self.seen
+        ]
+        for key in stale:
+            del self.entries[key]
+        
+        if not (self.dirty or stale):
+            return
+        
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=self.path.name, suffix='.tmp')
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'version': self.version, 'entries': self.entries}, f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+
+class _Miss(NamedTuple):
+    """A component file the stat fast path could not answer from the cache"""
+    path: str
+    rel_path: str
+    level: str
+    slot: List[Violation]
+    # (mtime_ns, size), or None without a cache
+    stat: Optional[Tuple[int, int]]
+    # Content hash of the file's current cache entry, if it has one
+    cached_digest: Optional[str]
 
 
 class AtomicDesignAnalyzer:
+    LEVELS = ['atoms', 'molecules', 'organisms']
     COMPONENT_EXTENSIONS = {'.tsx', '.jsx'}
     TEST_PATTERNS = {'.test.tsx', '.test.jsx', '.spec.tsx', '.spec.jsx'}
     BARREL_FILES = {'index.ts', 'index.tsx', 'index.js', 'index.jsx'}
     
-    # Patterns that suggest logic in component
+    # str.endswith takes a tuple directly, matching every suffix in C
+    _COMPONENT_EXT_TUPLE = tuple(sorted(COMPONENT_EXTENSIONS))
+    _TEST_PATTERN_TUPLE = tuple(sorted(TEST_PATTERNS))
+    
+    # Patterns that suggest logic in component. They are matched against raw
+    # bytes, where \w is ASCII-only, so identifiers also accept the bytes of
+    # non-ASCII UTF-8 characters.
     LOGIC_PATTERNS = [
-        r'const\s+\w+\s*=\s*\([^)]*\)\s*=>\s*\{',  # arrow functions
-        r'function\s+\w+\s*\([^)]*\)\s*\{',         # regular functions
-        r'async\s+function',                         # async functions
+        r'const\s+[\w\x80-\xff]+\s*=\s*\([^)]*\)\s*=>\s*\{',  # arrow functions
+        r'function\s+[\w\x80-\xff]+\s*\([^)]*\)\s*\{',         # regular functions
+        r'async(?=\s+function)',                              # async functions
     ]
     
     STATE_HOOKS = ['useState', 'useReducer', 'useEffect', 'useMemo', 'useCallback']
     
-    def __init__(self, src_path: str):
+    # atoms should not import from molecules or organisms
+    # molecules should not import from organisms
+    FORBIDDEN_IMPORTS = {
+        'atoms': ['molecules', 'organisms'],
+        'molecules': ['organisms'],
+        'organisms': []
+    }
+    
+    def __init__(self, src_path: str, use_cache: bool = True, jobs: int = 1, read_ahead: int = 1):
         self.src_path = Path(src_path)
         self.components_path = self.src_path / 'components'
         self.report = AnalysisReport()
+        self.use_cache = use_cache
+        self.jobs = jobs
+        self.read_ahead = read_ahead
+        self._cache: Optional[_FileCache] = None
+        self._cache_prefix = ''
+        # Every walked path starts with this prefix; slicing it off gives the
+        # path relative to components/ without a relative_to() per violation
+        self._rel_start = len(os.path.join(str(self.components_path), ''))
         
     def analyze(self) -> AnalysisReport:
-        if not self.components_path.exists():
+        # A single listing of components/ serves both the top-level structure
+        # check and the walk into each level directory
+        try:
+            with os.scandir(self.components_path) as it:
+                level_dirs = {e.name: e.path for e in it if e.is_dir()}
+        except OSError:
             self.report.add(Violation(
-                type="structure",
+                type=VType.STRUCTURE,
                 path=str(self.components_path),
+                rel_path=str(self.components_path),
                 message="components/ directory not found",
-                severity="error"
+                severity=Severity.ERROR
             ))
             return self.report
         
-        self._check_top_level_structure()
-        self._analyze_components()
+        if self.use_cache:
+            # Sibling source dirs share the cache file, so keys start with the
+            # src directory's own name. Resolved first: Path('.').parent is
+            # '.', which would put the cache inside src/.
+            src_dir = self.src_path.resolve()
+            self._cache_prefix = src_dir.name + '/'
+            self._cache = _FileCache.load(src_dir.parent / CACHE_FILE, _CACHE_VERSION, self._cache_prefix)
+        
+        self._check_top_level_structure(level_dirs)
+        self._analyze_components(level_dirs)
+        
+        if self._cache is not None:
+            self._cache.save()
         
         return self.report
     
-    def _check_top_level_structure(self):
+    def _check_top_level_structure(self, level_dirs: Dict[str, str]):
         """Check that atoms/, molecules/, organisms/ exist"""
-        expected_dirs = ['atoms', 'molecules', 'organisms']
-        
-        for dir_name in expected_dirs:
-            dir_path = self.components_path / dir_name
-            if not dir_path.exists():
+        for dir_name in self.LEVELS:
+            if dir_name not in level_dirs:
                 self.report.add(Violation(
-                    type="structure",
-                    path=str(dir_path),
+                    type=VType.STRUCTURE,
+                    path=str(self.components_path / dir_name),
+                    rel_path=dir_name,
                     message=f"Missing {dir_name}/ directory",
-                    severity="warning"
+                    severity=Severity.WARNING
                 ))
     
-    def _analyze_components(self):
+    def _analyze_components(self, level_dirs: Dict[str, str]):
         """Walk through all component directories"""
-        for level in ['atoms', 'molecules', 'organisms']:
-            level_path = self.components_path / level
-            if not level_path.exists():
+        # Violations are collected in walk order: one list per component for
+        # its structural checks and one per file, filled once files are analyzed
+        ordered: List[List[Violation]] = []
+        tasks: List[Tuple[os.DirEntry, str, str, List[Violation]]] = []
+        
+        for level in self.LEVELS:
+            if level not in level_dirs:
                 continue
                 
-            for component_dir in self._find_component_dirs(level_path):
-                self._analyze_component(component_dir, level)
+            for component_dir, entries in self._find_component_dirs(level_dirs[level]):
+                violations, component_files = self._analyze_component(component_dir, entries, level)
+                ordered.append(violations)
+                for file in component_files:
+                    slot: List[Violation] = []
+                    ordered.append(slot)
+                    tasks.append((file, file.path[self._rel_start:], level, slot))
+        
+        self._analyze_files(tasks)
+        
+        for violations in ordered:
+            for violation in violations:
+                self.report.add(violation)
     
-    def _find_component_dirs(self, base_path: Path) -> List[Path]:
-        """Find all component directories (directories containing .tsx files)"""
-        component_dirs = []
+    def _find_component_dirs(self, base_path: str) -> Iterator[Tuple[str, List[os.DirEntry]]]:
+        """Find all component directories (directories containing .tsx files)
         
-        for root, dirs, files in os.walk(base_path):
-            root_path = Path(root)
-            has_component = any(
-                f.endswith(tuple(self.COMPONENT_EXTENSIONS)) 
-                and not any(f.endswith(p) for p in self.TEST_PATTERNS)
-                for f in files
-            )
-            if has_component:
-                component_dirs.append(root_path)
+        Yields each directory with its scandir entries so the caller can reuse
+        the cached file type information instead of listing it again.
+        """
+        try:
+            with os.scandir(base_path) as it:
+                entries = list(it)
+        except OSError:
+            return
         
-        return component_dirs
+        has_component = any(
+            e.name.endswith(self._COMPONENT_EXT_TUPLE)
+            and not e.name.endswith(self._TEST_PATTERN_TUPLE)
+            and e.is_file()
+            for e in entries
+        )
+        if has_component:
+            yield base_path, entries
+        
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from self._find_component_dirs(entry.path)
     
-    def _analyze_component(self, component_path: Path, level: str):
-        """Analyze a single component directory"""
+    def _analyze_component(self, component_path: str, entries: List[os.DirEntry], level: str) -> Tuple[List[Violation], List[os.DirEntry]]:
+        """Analyze a single component directory
+        
+        Returns the component's structural violations and the component files
+        whose content still needs to be analyzed.
+        """
         self.report.components_found += 1
+        violations = []
+        rel_path = component_path[self._rel_start:]
         
-        files = list(component_path.iterdir())
-        file_names = {f.name for f in files if f.is_file()}
+        files = [e for e in entries if e.is_file()]
+        file_names = {f.name for f in files}
         
         # Check for barrel
         has_barrel = bool(file_names & self.BARREL_FILES)
         if has_barrel:
             self.report.components_with_barrels += 1
         else:
-            self.report.add(Violation(
-                type="barrel",
-                path=str(component_path),
+            violations.append(Violation(
+                type=VType.BARREL,
+                path=component_path,
+                rel_path=rel_path,
                 message="Missing barrel file (index.ts)",
-                severity="warning"
+                severity=Severity.WARNING
             ))
         
         # Check for tests
-        has_test = any(
-            any(f.endswith(pattern) for pattern in self.TEST_PATTERNS)
-            for f in file_names
-        )
+        has_test = any(name.endswith(self._TEST_PATTERN_TUPLE) for name in file_names)
         if has_test:
             self.report.components_with_tests += 1
         else:
-            self.report.add(Violation(
-                type="test",
-                path=str(component_path),
+            violations.append(Violation(
+                type=VType.TEST,
+                path=component_path,
+                rel_path=rel_path,
                 message="Missing test file",
-                severity="warning"
+                severity=Severity.WARNING
             ))
         
-        # Analyze component files for logic
-        for file in files:
-            if file.suffix in self.COMPONENT_EXTENSIONS:
-                if not any(file.name.endswith(p) for p in self.TEST_PATTERNS):
-                    self._check_component_logic(file, level)
-                    self._check_imports(file, level)
-    
-    def _check_component_logic(self, file_path: Path, level: str):
-        """Check if component has too much logic that should be in a hook"""
-        try:
-            content = file_path.read_text(encoding='utf-8')
-        except Exception:
-            return
+        # Component files to analyze for logic and imports
+        component_files = [
+            file for file in files
+            if file.name.endswith(self._COMPONENT_EXT_TUPLE)
+            and not file.name.endswith(self._TEST_PATTERN_TUPLE)
+        ]
         
-        # Count state hooks
-        hook_count = sum(content.count(hook) for hook in self.STATE_HOOKS)
+        return violations, component_files
+    
+    def _analyze_files(self, tasks: List[Tuple[os.DirEntry, str, str, List[Violation]]]):
+        """Analyze component files, in worker processes when --jobs asks for it"""
+        misses = self._stat_misses(tasks)
         
-        # Count function definitions (excluding the component itself)
-        function_matches = []
-        for pattern in self.LOGIC_PATTERNS:
-            function_matches.extend(re.findall(pattern, content))
+        if self.jobs > 1 and len(misses) >= PARALLEL_MIN_FILES:
+            self._analyze_in_pool(misses)
+            return
         
-        # Heuristic: if more than 2 hooks AND more than 2 functions, suggest extraction
-        if hook_count > 2 and len(function_matches) > 2:
-            self.report.add(Violation(
-                type="logic",
-                path=str(file_path),
-                message=f"Component has {hook_count} hooks and {len(function_matches)} functions. Consider extracting logic to a custom hook.",
-                severity="warning"
-            ))
+        for miss, data, key in self._read_misses(misses):
+            self._store(miss.slot, key, analyze_source(data, miss.path, miss.rel_path, miss.level))
     
-    def _check_imports(self, file_path: Path, level: str):
-        """Check for inverted dependencies"""
-        try:
-            content = file_path.read_text(encoding='utf-8')
-        except Exception:
-            return
+    def _stat_misses(self, tasks: List[Tuple[os.DirEntry, str, str, List[Violation]]]) -> List[_Miss]:
+        """Fill cache hits whose stat is unchanged and return the files left to analyze
+        
+        With a cache, a file whose (mtime_ns, size) matches its entry is never
+        opened.
+        """
+        cache = self._cache
+        misses = []
+        for file, rel_path, level, slot in tasks:
+            stat = None
+            cached_digest = None
+            if cache is not None:
+                try:
+                    st = file.stat()
+                except OSError:
+                    continue
+                stat = (st.st_mtime_ns, st.st_size)
+                cached = cache.get(self._cache_prefix + rel_path)
+                if cached is not None and (cached[1], cached[2]) == stat:
+                    slot.extend(_cached_violations(cached, file.path, rel_path))
+                    continue
+                if cached is not None:
+                    cached_digest = cached[3]
+            misses.append(_Miss(file.path, rel_path, level, slot, stat, cached_digest))
+        return misses
+    
+    def _read_misses(self, misses: List[_Miss]) -> Iterator[Tuple[_Miss, bytes, Optional[tuple]]]:
+        """Read each file (up to MAX_ANALYZE_BYTES) and yield those still needing analysis
         
-        # atoms should not import from molecules or organisms
-        # molecules should not import from organisms
+        With a cache, a file whose content hash still matches its entry only
+        gets its stored stat refreshed.
+        """
+        cache = self._cache
+        contents = _read_ahead([miss.path for miss in misses], self.read_ahead)
+        for miss, data in zip(misses, contents):
+            if data is None:
+                continue
+            
+            key = None
+            if cache is not None:
+                digest = _digest(data)
+                if digest == miss.cached_digest:
+                    self._reuse(miss)
+                    continue
+                key = (self._cache_prefix + miss.rel_path, *miss.stat, digest)
+            
+            yield miss, data, key
+    
+    def _analyze_in_pool(self, misses: List[_Miss]):
+        """Analyze files in worker processes that read the files themselves
         
-        forbidden_imports = {
-            'atoms': ['molecules', 'organisms'],
-            'molecules': ['organisms'],
-            'organisms': []
-        }
+        Only paths cross the process boundary, and the main process never holds
+        file contents. Workers are given each entry's cached digest and skip
+        the scan when the content still matches, as the serial path does.
+        """
+        # Imported here so serial runs do not pay for multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
         
-        for forbidden in forbidden_imports.get(level, []):
-            # Look for imports from forbidden level
-            pattern = rf"from\s+['\"].*/{forbidden}/|from\s+['\"]@/components/{forbidden}/"
-            if re.search(pattern, content):
-                self.report.add(Violation(
-                    type="dependency",
-                    path=str(file_path),
-                    message=f"{level.capitalize()} should not import from {forbidden}",
-                    severity="error"
-                ))
+        with_digest = self._cache is not None
+        with ProcessPoolExecutor(max_workers=self.jobs) as executor:
+            results = executor.map(
+                analyze_file,
+                [m.path for m in misses], [m.rel_path for m in misses], [m.level for m in misses],
+                [with_digest] * len(misses), [m.cached_digest for m in misses],
+                chunksize=16,
+            )
+            for miss, result in zip(misses, results):
+                if result is None:
+                    continue
+                digest, violations = result
+                if violations is None:
+                    self._reuse(miss)
+                    continue
+                key = (self._cache_prefix + miss.rel_path, *miss.stat, digest) if with_digest else None
+                self._store(miss.slot, key, violations)
+    
+    def _reuse(self, miss: _Miss):
+        """Refresh the stat of an entry whose content hash still matches and use its result"""
+        entry = self._cache.touch(self._cache_prefix + miss.rel_path, *miss.stat)
+        miss.slot.extend(_cached_violations(entry, miss.path, miss.rel_path))
+    
+    def _store(self, slot: List[Violation], key: Optional[tuple], violations: List[Violation]):
+        if key is not None:
+            self._cache.put(*key, violations)
+        slot.extend(violations)
+
+
+# Compiled once at import time so per-file checks skip the re module cache.
+# Patterns are bytes so file contents are matched without decoding them.
+# Hooks get their own pass: function and arrow matches consume their names
+# and parameters, which would hide hooks such as "function useStateMachine".
+_HOOK_RE = re.compile('|'.join(map(re.escape, AtomicDesignAnalyzer.STATE_HOOKS)).encode('ascii'))
+_LOGIC_SCAN_RE = re.compile('|'.join(AtomicDesignAnalyzer.LOGIC_PATTERNS).encode('ascii'))
+
+# Specialized once per level: one alternation covers all of a level's
+# forbidden levels (captured as "forbidden"); levels with none get no pattern.
+# Each match stays inside one import specifier, so two imports on the same
+# line are found separately, and the level must follow a '/' as in
+# '../molecules/' or '@/components/molecules/'.
+_FORBIDDEN_IMPORT_RE = {
+    level: re.compile(rf"from\s+['\"][^'\"\n]*/(?P<forbidden>{'|'.join(forbidden)})/".encode('ascii')) if forbidden else None
+    for level, forbidden in AtomicDesignAnalyzer.FORBIDDEN_IMPORTS.items()
+}
+
+# Cached results are only valid for the rules that produced them. Python's
+# hash() is salted per process, so the ruleset is fingerprinted with blake2b.
+_CACHE_VERSION = ANALYZER_VERSION + ':' + hashlib.blake2b(repr((
+    _HOOK_RE.pattern,
+    _LOGIC_SCAN_RE.pattern,
+    sorted((level, rx.pattern) for level, rx in _FORBIDDEN_IMPORT_RE.items() if rx is not None),
+    MAX_ANALYZE_BYTES,
+)).encode('utf-8'), digest_size=8).hexdigest()
+
+
+def _cached_violations(entry: list, file_path: str, rel_path: str) -> List[Violation]:
+    return [
+        Violation(type=VType(vtype), path=file_path, rel_path=rel_path,
+                  message=message, severity=Severity(severity))
+        for vtype, message, severity in entry[4]
+    ]
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _read_head(file_path: str) -> Optional[bytes]:
+    try:
+        with open(file_path, 'rb') as f:
+            return f.read(MAX_ANALYZE_BYTES)
+    except Exception:
+        return None
+
+
+def _read_ahead(file_paths: List[str], workers: int = 1) -> Iterator[Optional[bytes]]:
+    """Yield file contents in order, with up to `workers` reads in flight
+    
+    Blocking reads release the GIL, so on slow or network filesystems the
+    round-trips overlap instead of being paid one after another. On a local
+    disk threads only add overhead, so a single worker reads sequentially.
+    """
+    if workers <= 1:
+        for file_path in file_paths:
+            yield _read_head(file_path)
+        return
+    
+    from concurrent.futures import ThreadPoolExecutor
+    
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for file_path in file_paths:
+            pending.append(executor.submit(_read_head, file_path))
+            if len(pending) >= workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def analyze_file(
+    file_path: str, rel_path: str, level: str,
+    with_digest: bool = False, cached_digest: Optional[str] = None,
+) -> Optional[Tuple[Optional[str], Optional[List[Violation]]]]:
+    """Read and analyze one component file; the entry point for worker processes
+    
+    Returns None if the file cannot be read, otherwise the content digest
+    (when requested, for the cache) and the file's violations. The violations
+    are None when the digest equals cached_digest, so the cached result stands.
+    """
+    data = _read_head(file_path)
+    if data is None:
+        return None
+    digest = _digest(data) if with_digest else None
+    if digest is not None and digest == cached_digest:
+        return digest, None
+    return digest, analyze_source(data, file_path, rel_path, level)
+
+
+def analyze_source(data: bytes, file_path: str, rel_path: str, level: str) -> List[Violation]:
+    """Run every content check on a component file's raw bytes
+    
+    Kept free of analyzer state so it can run in worker processes. The bytes
+    are scanned as-is: every rule is ASCII, so no UTF-8 decode is needed.
+    """
+    hook_count = 0
+    function_count = 0
+    
+    if _may_have_logic(data):
+        hook_count = sum(1 for _ in _HOOK_RE.finditer(data))
+        if hook_count > 2:
+            function_count = sum(1 for _ in _LOGIC_SCAN_RE.finditer(data))
+    
+    found = _scan_imports(data, level)
+    
+    return (
+        _logic_violations(hook_count, function_count, file_path, rel_path)
+        + _dependency_violations(found, file_path, rel_path, level)
+    )
+
+
+def _may_have_logic(content: bytes) -> bool:
+    """Cheap substring counts that bound hook and function totals from above"""
+    # Every state hook starts with "use"; every arrow match contains "=>" and
+    # every function match contains "function" (an "async function" can be
+    # counted twice). Most files are ruled out here before any regex runs.
+    if content.count(b'use') < 3:
+        return False
+    return content.count(b'=>') + 2 * content.count(b'function') >= 3
+
+
+def _scan_imports(content: bytes, level: str) -> Set[str]:
+    """Find the forbidden levels a file imports from"""
+    rx = _FORBIDDEN_IMPORT_RE[level]
+    if rx is None:
+        return set()
+    
+    # Look for imports from any forbidden level in a single pass, stopping
+    # once every forbidden level has been seen
+    forbidden_levels = AtomicDesignAnalyzer.FORBIDDEN_IMPORTS[level]
+    found = set()
+    for m in rx.finditer(content):
+        found.add(m['forbidden'].decode('ascii'))
+        if len(found) == len(forbidden_levels):
+            break
+    return found
+
+
+def _logic_violations(hook_count: int, function_count: int, file_path: str, rel_path: str) -> List[Violation]:
+    """Check if component has too much logic that should be in a hook"""
+    # Heuristic: if more than 2 hooks AND more than 2 functions, suggest extraction
+    if hook_count > 2 and function_count > 2:
+        return [Violation(
+            type=VType.LOGIC,
+            path=file_path,
+            rel_path=rel_path,
+            message=f"Component has {hook_count} hooks and {function_count} functions. Consider extracting logic to a custom hook.",
+            severity=Severity.WARNING
+        )]
+    return []
+
+
+def _dependency_violations(found: Set[str], file_path: str, rel_path: str, level: str) -> List[Violation]:
+    """Check for inverted dependencies"""
+    return [
+        Violation(
+            type=VType.DEPENDENCY,
+            path=file_path,
+            rel_path=rel_path,
+            message=f"{level.capitalize()} should not import from {forbidden}",
+            severity=Severity.ERROR
+        )
+        for forbidden in AtomicDesignAnalyzer.FORBIDDEN_IMPORTS[level]
+        if forbidden in found
+    ]
 
 
 def print_report(report: AnalysisReport):
     """Print analysis report to console"""
+    # Lines are collected and written once instead of one print() per line
+    out = []
     
-    print("\n" + "=" * 60)
-    print("  ATOMIC DESIGN ANALYSIS REPORT")
-    print("=" * 60 + "\n")
+    out.append("\n" + "=" * 60)
+    out.append("  ATOMIC DESIGN ANALYSIS REPORT")
+    out.append("=" * 60 + "\n")
     
     # Summary
-    print(f"📦 Components found: {report.components_found}")
-    print(f"✅ With tests: {report.components_with_tests}/{report.components_found}")
-    print(f"📄 With barrels: {report.components_with_barrels}/{report.components_found}")
-    print()
+    out.append(f"📦 Components found: {report.components_found}")
+    out.append(f"✅ With tests: {report.components_with_tests}/{report.components_found}")
+    out.append(f"📄 With barrels: {report.components_with_barrels}/{report.components_found}")
+    out.append("")
     
-    if not report.violations:
-        print("🎉 No violations found! Your structure looks good.\n")
+    if not report.types:
+        out.append("🎉 No violations found! Your structure looks good.\n")
+        sys.stdout.write("\n".join(out) + "\n")
         return
     
-    # Group violations by type
-    by_type = {}
-    for v in report.violations:
-        by_type.setdefault(v.type, []).append(v)
-    
     type_icons = {
-        'structure': '🏗️ ',
-        'barrel': '📄',
-        'test': '🧪',
-        'logic': '⚙️ ',
-        'dependency': '🔗'
+        VType.STRUCTURE: '🏗️ ',
+        VType.BARREL: '📄',
+        VType.TEST: '🧪',
+        VType.LOGIC: '⚙️ ',
+        VType.DEPENDENCY: '🔗'
     }
     
     type_titles = {
-        'structure': 'Structure Issues',
-        'barrel': 'Missing Barrels',
-        'test': 'Missing Tests',
-        'logic': 'Logic in Components',
-        'dependency': 'Dependency Violations'
+        VType.STRUCTURE: 'Structure Issues',
+        VType.BARREL: 'Missing Barrels',
+        VType.TEST: 'Missing Tests',
+        VType.LOGIC: 'Logic in Components',
+        VType.DEPENDENCY: 'Dependency Violations'
     }
     
-    for vtype, violations in by_type.items():
+    for vtype, indices in report.by_type.items():
         icon = type_icons.get(vtype, '⚠️')
-        title = type_titles.get(vtype, vtype)
+        title = type_titles.get(vtype, vtype.name.lower())
         
-        print(f"{icon} {title} ({len(violations)})")
-        print("-" * 40)
+        out.append(f"{icon} {title} ({len(indices)})")
+        out.append("-" * 40)
         
-        for v in violations:
-            severity_icon = "❌" if v.severity == "error" else "⚠️"
-            # Show relative path
-            rel_path = v.path.split('/components/')[-1] if '/components/' in v.path else v.path
-            print(f"  {severity_icon} {rel_path}")
-            print(f"     {v.message}")
-        print()
+        for i in indices:
+            severity_icon = "❌" if report.severities[i] == Severity.ERROR else "⚠️"
+            out.append(f"  {severity_icon} {report.rel_paths[i]}")
+            out.append(f"     {report.messages[i]}")
+        out.append("")
     
     # Final summary
-    errors = sum(1 for v in report.violations if v.severity == "error")
-    warnings = sum(1 for v in report.violations if v.severity == "warning")
+    errors = report.severity_counts[Severity.ERROR]
+    warnings = report.severity_counts[Severity.WARNING]
     
-    print("-" * 60)
+    out.append("-" * 60)
     if errors:
-        print(f"❌ {errors} error(s), {warnings} warning(s)")
+        out.append(f"❌ {errors} error(s), {warnings} warning(s)")
     else:
-        print(f"⚠️  {warnings} warning(s), no errors")
-    print()
+        out.append(f"⚠️  {warnings} warning(s), no errors")
+    out.append("")
+    
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Detect Atomic Design violations in a React project.")
     # Default to current directory's src/
-    src_path = sys.argv[1] if len(sys.argv) > 1 else './src'
+    parser.add_argument('src_path', nargs='?', default='./src', help="path to the project's src/ directory")
+    parser.add_argument('--no-cache', action='store_true', help=f"do not read or write {CACHE_FILE}")
+    parser.add_argument('--jobs', '-j', type=int, default=1, metavar='N',
+                        help="worker processes for file analysis (default: 1, no worker processes)")
+    parser.add_argument('--read-ahead', type=int, default=1, metavar='N',
+                        help="file reads kept in flight, for slow or network filesystems (default: 1)")
+    args = parser.parse_args()
+    src_path = args.src_path
     
     if not os.path.exists(src_path):
         print(f"Error: Path '{src_path}' does not exist")
-        print(f"Usage: python {sys.argv[0]} [path_to_src]")
+        print(f"Usage: python {sys.argv[0]} [path_to_src] [--no-cache] [--jobs N] [--read-ahead N]")
         sys.exit(1)
     
-    analyzer = AtomicDesignAnalyzer(src_path)
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if args.read_ahead < 1:
+        parser.error("--read-ahead must be at least 1")
+    
+    analyzer = AtomicDesignAnalyzer(src_path, use_cache=not args.no_cache, jobs=args.jobs,
+                                    read_ahead=args.read_ahead)
     report = analyzer.analyze()
     print_report(report)
     